@@ -1,162 +1,339 @@
 """Flask application for METAR weather reader."""
 
+import hashlib
 import logging
-from flask import Flask, render_template, jsonify
-from services.metar_fetcher import fetch_metar, MetarFetchError
-from services.metar_parser import parse_metar, MetarParseError
-from utils.formatters import format_weather_summary
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Flask, current_app, render_template, jsonify, request
+from flask_caching import Cache
+from flask_compress import Compress
+from werkzeug.routing import BaseConverter
+from services.metar_fetcher import MetarFetchError
+from services.metar_parser import MetarParseError
+from services.metar_service import get_weather_bundle, prefetch_metars
+from utils.formatters import NOT_AVAILABLE, format_weather_summary, format_whole_number
+from utils.json_provider import ORJSONProvider
 import config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-app.config.from_object(config)
+# Worker threads for concurrent upstream fetches in batch lookups
+_EXECUTOR = ThreadPoolExecutor(max_workers=config.BATCH_FETCH_WORKERS)
 
 
-@app.route('/')
+def _configure_logging():
+    """Configure root logging for running the app directly."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+class IcaoConverter(BaseConverter):
+    """URL converter that only matches 4-letter ICAO codes."""
+
+    regex = '[A-Za-z]{4}'
+
+
+# Extensions are bound to an app in create_app()
+cache = Cache()
+compress = Compress()
+
+bp = Blueprint('weather', __name__)
+
+
+# Rendered home page and its ETag, filled on first request
+_index_html = None
+_index_etag = None
+
+
+@bp.route('/')
 def index():
-    """Render the home page."""
-    return render_template('index.html')
+    """Render the home page, reusing the rendered HTML across requests."""
+    global _index_html, _index_etag
+
+    # Re-render in debug mode so template edits show up immediately
+    if _index_html is None or current_app.debug:
+        _index_html = render_template('index.html')
+        _index_etag = hashlib.md5(_index_html.encode(), usedforsecurity=False).hexdigest()
 
+    if _etag_matches(_index_etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(_index_html, mimetype='text/html')
+    response.set_etag(_index_etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response
 
-@app.route('/api/weather/<icao_code>')
+
+@bp.route('/api/weather/<icao:icao_code>')
 def get_weather(icao_code):
     """
     Fetch and parse METAR data for the specified airport.
 
+    Successful responses carry an ETag derived from the raw METAR, so
+    clients revalidating an unchanged report get a 304.
+
     Args:
         icao_code: 4-letter ICAO airport code
 
     Returns:
         JSON response with weather data or error message
     """
+    result, status = _lookup_weather(icao_code.upper(), _cached_body)
+    if status != 200:
+        return result, status
+
+    body, etag = result
+    if _etag_matches(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = (
+        f'public, max-age={config.METAR_CACHE_TTL}, stale-while-revalidate=60'
+    )
+    return response
+
+
+@bp.route('/api/weather')
+def get_weather_batch():
+    """
+    Fetch and parse METAR data for several airports.
+
+    All airports are requested from the API in a single call; airports
+    missing from that response are then fetched individually in parallel.
+
+    Query Args:
+        ids: Comma-separated ICAO airport codes (e.g., KJFK,KSEA)
+
+    Returns:
+        JSON response with per-airport results keyed by ICAO code
+    """
+    ids = request.args.get('ids', '')
+    codes = list(dict.fromkeys(c.strip().upper() for c in ids.split(',') if c.strip()))
+
+    if not codes:
+        return jsonify({
+            'success': False,
+            'error': 'No ICAO codes provided. Use ?ids=KJFK,KSEA'
+        }), 400
+
+    if len(codes) > config.MAX_BATCH_SIZE:
+        return jsonify({
+            'success': False,
+            'error': f"Too many ICAO codes. Maximum is {config.MAX_BATCH_SIZE}."
+        }), 400
+
+    # One upstream request for every airport, then per-airport parsing
+    prefetch_metars(codes)
+
+    results = {
+        code: payload
+        for code, (payload, _status) in zip(codes, _EXECUTOR.map(_lookup_weather, codes))
+    }
+
+    return jsonify({'success': True, 'results': results})
+
+
+def _lookup_weather(icao_code, build_payload=None):
+    """
+    Look up the weather response payload for a single airport.
+
+    Args:
+        icao_code: 4-letter ICAO airport code, already upper-cased
+        build_payload: Builds the successful result from (icao_code,
+            raw METAR, WeatherData); defaults to _build_payload
+
+    Returns:
+        tuple: (build_payload result, or an error dict; HTTP status code)
+    """
     try:
-        # Fetch raw METAR data
-        raw_metar = fetch_metar(icao_code)
-
-        # Parse METAR into structured data
-        weather_data = parse_metar(raw_metar)
-
-        # Generate human-readable summary
-        summary = format_weather_summary(weather_data)
-
-        # Prepare response
-        response = {
-            'success': True,
-            'icao_code': icao_code.upper(),
-            'summary': summary,
-            'data': {
-                'Location': weather_data.get('station', 'Unknown'),
-                'Time': weather_data.get('time', 'Not available'),
-                'Weather Conditions': _format_conditions(weather_data),
-                'Temperature': _format_temp(weather_data),
-                'Wind': _format_wind_display(weather_data),
-                'Visibility': _format_visibility_display(weather_data),
-                'Pressure': _format_pressure_display(weather_data),
-                'Sky Conditions': _format_sky_display(weather_data),
-            },
-            'raw_metar': raw_metar
-        }
-
-        return jsonify(response)
+        # Fetch and parse the METAR (cached per airport)
+        raw_metar, weather_data = get_weather_bundle(icao_code)
+
+        return (build_payload or _build_payload)(icao_code, raw_metar, weather_data), 200
 
     except MetarFetchError as e:
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        }), 400
+        }, 400
 
     except MetarParseError as e:
-        return jsonify({
+        return {
             'success': False,
             'error': f"Unable to parse METAR data: {str(e)}"
-        }), 400
+        }, 400
 
     except Exception as e:
-        logger.exception(f"Unexpected error processing METAR for {icao_code}: {e}")
-        return jsonify({
+        logger.exception("Unexpected error processing METAR for %s: %s", icao_code, e)
+        return {
             'success': False,
             'error': 'An unexpected error occurred. Please try again.'
-        }), 500
+        }, 500
 
 
-def _format_conditions(weather_data):
-    """Format weather conditions for display."""
-    weather = weather_data.get('weather', [])
-    if weather:
-        return ', '.join(weather)
-    return 'Clear'
+def _build_payload(icao_code, raw_metar, weather_data):
+    """
+    Build the successful weather response payload for a single airport.
 
+    Args:
+        icao_code: 4-letter ICAO airport code, already upper-cased
+        raw_metar: Raw METAR string
+        weather_data: WeatherData parsed from raw_metar
 
-def _format_temp(weather_data):
-    """Format temperature for display."""
-    temp_f = weather_data.get('temp_f')
-    temp_c = weather_data.get('temp_c')
-    if temp_f is not None and temp_c is not None:
-        return f"{int(round(temp_f))}°F ({int(round(temp_c))}°C)"
-    return 'Not available'
+    Returns:
+        dict: Response payload
+    """
+    # Generate human-readable summary
+    summary = format_weather_summary(weather_data)
 
+    # Prepare response
+    return {
+        'success': True,
+        'icao_code': icao_code,
+        'summary': summary,
+        'data': _build_display(weather_data),
+        'raw_metar': raw_metar
+    }
 
-def _format_wind_display(weather_data):
-    """Format wind for display."""
-    speed_mph = weather_data.get('wind_speed_mph', 0)
-    speed_kt = weather_data.get('wind_speed_kt', 0)
-    direction = weather_data.get('wind_dir_text', 'Calm')
 
-    if speed_mph == 0:
-        return 'Calm'
+def _cached_body(icao_code, raw_metar, weather_data):
+    """
+    Serialize the weather response for one report, reusing earlier results.
 
-    return f"{int(round(speed_mph))} mph ({int(round(speed_kt))} kt) from {direction}"
+    Bodies are keyed on the raw METAR through its ETag, so a cached body is
+    only reused while the service still holds that report and can never
+    outlive it.
 
+    Args:
+        icao_code: 4-letter ICAO airport code, already upper-cased
+        raw_metar: Raw METAR string
+        weather_data: WeatherData parsed from raw_metar
 
-def _format_visibility_display(weather_data):
-    """Format visibility for display."""
-    vis = weather_data.get('visibility_mi')
-    if vis is None:
-        return 'Not available'
+    Returns:
+        tuple: (JSON response body bytes, ETag)
+    """
+    etag = hashlib.md5(raw_metar.encode(), usedforsecurity=False).hexdigest()
+    key = f'weather:{icao_code}:{etag}'
+
+    body = cache.get(key)
+    if body is None:
+        payload = _build_payload(icao_code, raw_metar, weather_data)
+        body = current_app.json.response(payload).get_data()
+        cache.set(key, body)
+
+    return body, etag
+
+
+def _etag_matches(etag):
+    """
+    Check whether the request's If-None-Match header covers an ETag.
+
+    Flask-Compress appends the encoding (e.g. ``:gzip``) to the ETag of
+    compressed responses, so that suffix is ignored when comparing.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(tag.split(':', 1)[0] == etag for tag in if_none_match)
+
+
+def _build_display(weather_data):
+    """
+    Format parsed METAR data into the display table.
+
+    Args:
+        weather_data: WeatherData parsed from the METAR
+
+    Returns:
+        dict: Display labels mapped to formatted values
+    """
+    whole = format_whole_number
+    weather = weather_data.weather
+    temp_f = weather_data.temp_f
+    temp_c = weather_data.temp_c
+    speed_mph = weather_data.wind_speed_mph
+    vis = weather_data.visibility_mi
+    pressure_in = weather_data.pressure_in
+    pressure_mb = weather_data.pressure_mb
+    sky = weather_data.sky_conditions
 
-    if vis >= 10:
-        return '10+ miles'
-    elif vis == int(vis):
-        return f'{int(vis)} miles'
+    if temp_f is not None and temp_c is not None:
+        temperature = f"{whole(temp_f)}°F ({whole(temp_c)}°C)"
     else:
-        return f'{vis:.1f} miles'
+        temperature = NOT_AVAILABLE
 
+    if speed_mph == 0:
+        wind = 'Calm'
+    else:
+        speed_kt = weather_data.wind_speed_kt
+        direction = weather_data.wind_dir_text
+        wind = f"{whole(speed_mph)} mph ({whole(speed_kt)} kt) from {direction}"
 
-def _format_pressure_display(weather_data):
-    """Format pressure for display."""
-    pressure_in = weather_data.get('pressure_in')
-    pressure_mb = weather_data.get('pressure_mb')
+    if vis is None:
+        visibility = NOT_AVAILABLE
+    elif vis >= 10:
+        visibility = '10+ miles'
+    elif float(vis).is_integer():
+        visibility = f'{int(vis)} miles'
+    else:
+        visibility = f'{vis:.1f} miles'
 
     if pressure_in is not None and pressure_mb is not None:
-        return f"{pressure_in:.2f} inHg ({int(round(pressure_mb))} mb)"
-    return 'Not available'
-
+        pressure = f"{pressure_in:.2f} inHg ({whole(pressure_mb)} mb)"
+    else:
+        pressure = NOT_AVAILABLE
 
-def _format_sky_display(weather_data):
-    """Format sky conditions for display."""
-    sky = weather_data.get('sky_conditions', [])
-    if not sky:
-        return 'Not reported'
-    return ', '.join(sky)
+    return {
+        'Location': weather_data.station,
+        'Time': weather_data.time,
+        'Weather Conditions': ', '.join(weather) if weather else 'Clear',
+        'Temperature': temperature,
+        'Wind': wind,
+        'Visibility': visibility,
+        'Pressure': pressure,
+        'Sky Conditions': ', '.join(sky) if sky else 'Not reported',
+    }
 
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     return jsonify({'success': False, 'error': 'Page not found'}), 404
 
 
-@app.errorhandler(500)
+@bp.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
 
+def create_app(config_object=config):
+    """
+    Create and configure the Flask application.
+
+    Args:
+        config_object: Object holding Flask settings (defaults to config)
+
+    Returns:
+        Flask: Configured application
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+    app.json = ORJSONProvider(app)
+    app.url_map.converters['icao'] = IcaoConverter
+    compress.init_app(app)
+    cache.init_app(app)
+    app.register_blueprint(bp)
+    return app
+
+
+# Module-level app for `python app.py`, `gunicorn app:app` and the tests
+app = create_app()
+
+
 if __name__ == '__main__':
+    _configure_logging()
     app.run(debug=config.DEBUG, host='0.0.0.0', port=5555)
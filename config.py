@@ -8,6 +8,17 @@ AVIATIONWEATHER_API_URL = "https://aviationweather.gov/api/data/metar"
 # Request timeout in seconds
 REQUEST_TIMEOUT = 10
 
+# How long fetched METARs are served from memory, in seconds
+METAR_CACHE_TTL = 300
+
+# Batch lookups: maximum airports per request and concurrent upstream fetches
+MAX_BATCH_SIZE = 20
+BATCH_FETCH_WORKERS = 16
+
+# View response cache (Flask-Caching)
+CACHE_TYPE = 'SimpleCache'
+CACHE_DEFAULT_TIMEOUT = METAR_CACHE_TTL
+
 # Flask configuration
 # DEBUG should be False in production. Set via FLASK_DEBUG environment variable.
 DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() in ('true', '1', 'yes')
@@ -0,0 +1,18 @@
+"""Gunicorn configuration for serving the METAR reader in production."""
+
+import multiprocessing
+import os
+
+# Bind to the same port as the development server
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5555')
+
+# Threaded workers suit the I/O-bound METAR fetches
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Keep client connections open briefly for follow-up requests
+keepalive = 5
+
+# Import the app once in the master so workers fork with modules already loaded
+preload_app = True
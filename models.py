@@ -0,0 +1,58 @@
+"""Plain data types shared by the METAR services and formatters."""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
+
+# Wind direction text for calm and variable winds. Interned, like the parser's
+# compass names, so equality checks downstream hit the identity fast path.
+WIND_CALM = sys.intern('Calm')
+WIND_VARIABLE = sys.intern('Variable')
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherData:
+    """
+    Structured weather data decoded from a METAR report.
+
+    Instances are immutable so parsed results can be shared from the cache.
+    """
+
+    station: str = 'Unknown'
+    time: Optional[str] = None
+    temp_c: Optional[float] = None
+    temp_f: Optional[float] = None
+    dewpoint_c: Optional[float] = None
+    dewpoint_f: Optional[float] = None
+    wind_speed_kt: float = 0
+    wind_speed_mph: float = 0
+    wind_dir: Optional[float] = None
+    wind_dir_text: str = WIND_VARIABLE
+    visibility_mi: Optional[float] = None
+    pressure_mb: Optional[float] = None
+    pressure_in: Optional[float] = None
+    sky_conditions: Tuple[str, ...] = ()
+    weather: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build WeatherData from a dictionary of parsed values.
+
+        Unknown keys are ignored and list values are stored as tuples.
+
+        Args:
+            data: Dictionary keyed by WeatherData field names
+
+        Returns:
+            WeatherData: Structured weather data
+        """
+        # One pass over the input, so each value is read without a second lookup
+        values = {name: value for name, value in data.items() if name in _FIELD_NAMES}
+        for name in ('sky_conditions', 'weather'):
+            if name in values:
+                values[name] = tuple(values[name] or ())
+        return cls(**values)
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(WeatherData))
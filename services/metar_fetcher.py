@@ -1,9 +1,30 @@
 """METAR data fetcher - handles API calls to aviationweather.gov."""
 
-import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import AVIATIONWEATHER_API_URL, REQUEST_TIMEOUT
 
+# Shared session so keep-alive connections to the API are reused across requests
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+))
+_SESSION.headers.update({
+    'User-Agent': 'cc-metar-reader/1.0',
+    'Accept-Encoding': 'gzip',
+})
+
+# Upper bound on the response body we read; a METAR is well under 1 KB
+_MAX_BODY_BYTES = 8192
+
 
 class MetarFetchError(Exception):
     """Exception raised when METAR data cannot be fetched."""
@@ -23,9 +44,8 @@ def validate_icao_code(icao_code):
     if not icao_code:
         return False
 
-    # ICAO codes are 4 letters
-    pattern = r'^[A-Z]{4}$'
-    return bool(re.match(pattern, icao_code.upper()))
+    # ICAO codes are 4 ASCII letters
+    return len(icao_code) == 4 and icao_code.isascii() and icao_code.isalpha()
 
 
 def fetch_metar(icao_code):
@@ -47,30 +67,89 @@ def fetch_metar(icao_code):
 
     icao_code = icao_code.upper()
 
+    metar_text = _request_metars(icao_code, _MAX_BODY_BYTES)
+
+    if not metar_text:
+        raise MetarFetchError(f"No METAR data found for airport: {icao_code}")
+
+    return metar_text
+
+
+def fetch_metars(icao_codes):
+    """
+    Fetch METAR data for several airports in a single API request.
+
+    Args:
+        icao_codes: Iterable of 4-letter ICAO airport codes
+
+    Returns:
+        dict: Raw METAR strings keyed by upper-case ICAO code; airports
+            without a current report are omitted
+
+    Raises:
+        MetarFetchError: If data cannot be fetched or any code is invalid
+    """
+    # Upper-cased codes in request order, without duplicates
+    codes = {}
+    for icao_code in icao_codes:
+        if not validate_icao_code(icao_code):
+            raise MetarFetchError(f"Invalid ICAO code format: {icao_code}. Must be 4 letters.")
+        codes[icao_code.upper()] = None
+
+    if not codes:
+        return {}
+
+    metar_text = _request_metars(','.join(codes), _MAX_BODY_BYTES * len(codes))
+
+    metars = {}
+    for line in metar_text.splitlines():
+        line = line.strip()
+        tokens = line.split(maxsplit=2)
+        if not tokens:
+            continue
+        # Reports may be prefixed with their type
+        station = tokens[1] if tokens[0] in ('METAR', 'SPECI') and len(tokens) > 1 else tokens[0]
+        if station in codes and station not in metars:
+            metars[station] = line
+
+    return metars
+
+
+def _request_metars(ids, max_bytes):
+    """
+    Request raw METAR text from the API.
+
+    Args:
+        ids: Comma-separated upper-case ICAO codes
+        max_bytes: Maximum number of body bytes to read
+
+    Returns:
+        str: Response body, stripped; empty if no reports were found
+
+    Raises:
+        MetarFetchError: If the request fails
+    """
     try:
         # Build request URL
-        params = {'ids': icao_code}
+        params = {'ids': ids}
 
-        # Make API request
-        response = requests.get(
+        # Make API request, streaming so only a bounded prefix is read
+        with _SESSION.get(
             AVIATIONWEATHER_API_URL,
             params=params,
-            timeout=REQUEST_TIMEOUT
-        )
-
-        # Check for HTTP errors
-        response.raise_for_status()
-
-        # Get the METAR text
-        metar_text = response.text.strip()
+            timeout=REQUEST_TIMEOUT,
+            stream=True
+        ) as response:
+            # Check for HTTP errors
+            response.raise_for_status()
 
-        if not metar_text:
-            raise MetarFetchError(f"No METAR data found for airport: {icao_code}")
+            # Get the METAR text; reports are plain ASCII
+            body = response.raw.read(max_bytes, decode_content=True)
 
-        return metar_text
+        return body.decode('ascii', 'ignore').strip()
 
     except requests.exceptions.Timeout:
-        raise MetarFetchError(f"Request timed out while fetching METAR for {icao_code}")
+        raise MetarFetchError(f"Request timed out while fetching METAR for {ids}")
 
     except requests.exceptions.ConnectionError:
         raise MetarFetchError("Unable to connect to aviation weather service")
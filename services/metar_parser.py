@@ -1,10 +1,26 @@
 """METAR parser - decodes METAR strings using python-metar library."""
 
 import logging
+import sys
+from threading import Lock
+
+from cachetools import TTLCache
 from metar.Metar import Metar
+from models import WeatherData, WIND_CALM, WIND_VARIABLE
 
 logger = logging.getLogger(__name__)
 
+# Parsed results keyed by the exact METAR string; a report is stable for its window
+_PARSE_CACHE = TTLCache(maxsize=2048, ttl=600)
+_PARSE_CACHE_LOCK = Lock()
+
+# 16-point compass; each direction covers 22.5 degrees
+_DIRECTIONS = tuple(map(sys.intern, ('N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                                     'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW')))
+
+# Compass direction for every whole degree, so lookups need no float math
+_COMPASS_LUT = tuple(_DIRECTIONS[int((d + 11.25) / 22.5) % 16] for d in range(360))
+
 
 class MetarParseError(Exception):
     """Exception raised when METAR data cannot be parsed."""
@@ -19,7 +35,7 @@ def parse_metar(metar_string):
         metar_string: Raw METAR string from API
 
     Returns:
-        dict: Parsed weather data with keys:
+        WeatherData: Parsed weather data with fields:
             - station: Airport ICAO code
             - time: Observation time
             - temp_c: Temperature in Celsius
@@ -33,8 +49,8 @@ def parse_metar(metar_string):
             - visibility_mi: Visibility in statute miles
             - pressure_mb: Pressure in millibars
             - pressure_in: Pressure in inches of mercury
-            - sky_conditions: List of sky condition strings
-            - weather: List of weather phenomena
+            - sky_conditions: Tuple of sky condition strings
+            - weather: Tuple of weather phenomena
 
     Raises:
         MetarParseError: If METAR cannot be parsed
@@ -42,6 +58,11 @@ def parse_metar(metar_string):
     if not metar_string:
         raise MetarParseError("METAR string is empty")
 
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(metar_string)
+    if cached is not None:
+        return cached
+
     try:
         # Parse the METAR using python-metar library
         obs = Metar(metar_string)
@@ -81,7 +102,7 @@ def parse_metar(metar_string):
             data['wind_dir_text'] = _degrees_to_compass(obs.wind_dir.value())
         else:
             data['wind_dir'] = None
-            data['wind_dir_text'] = 'Variable' if data['wind_speed_kt'] > 0 else 'Calm'
+            data['wind_dir_text'] = WIND_VARIABLE if data['wind_speed_kt'] > 0 else WIND_CALM
 
         # Visibility
         if obs.vis:
@@ -134,10 +155,15 @@ def parse_metar(metar_string):
         else:
             data['weather'] = []
 
-        return data
+        weather_data = WeatherData.from_dict(data)
+
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[metar_string] = weather_data
+
+        return weather_data
 
     except Exception as e:
-        logger.error(f"Failed to parse METAR string: {metar_string[:100]}... Error: {e}")
+        logger.error("Failed to parse METAR string: %s... Error: %s", metar_string[:100], e)
         raise MetarParseError(f"Failed to parse METAR: {str(e)}") from e
 
 
@@ -146,17 +172,9 @@ def _degrees_to_compass(degrees):
     Convert wind direction in degrees to compass direction.
 
     Args:
-        degrees: Wind direction in degrees (0-360)
+        degrees: Wind direction in degrees (0-360); fractions are truncated
 
     Returns:
         str: Compass direction (N, NE, E, etc.)
     """
-    if degrees is None:
-        return 'Variable'
-
-    directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
-                  'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-
-    # Each direction covers 22.5 degrees
-    index = int((degrees + 11.25) / 22.5) % 16
-    return directions[index]
+    return WIND_VARIABLE if degrees is None else _COMPASS_LUT[int(degrees) % 360]
@@ -0,0 +1,82 @@
+"""METAR service - combines fetching and parsing behind a single cache.
+
+This is the only place fetched METARs are cached, so a report is never
+served more than METAR_CACHE_TTL seconds after it was fetched.
+"""
+
+import logging
+from threading import Lock
+
+from cachetools import TTLCache
+from config import METAR_CACHE_TTL
+from services.metar_fetcher import fetch_metar, fetch_metars, validate_icao_code, MetarFetchError
+from services.metar_parser import parse_metar, MetarParseError
+
+logger = logging.getLogger(__name__)
+
+# Raw and parsed METARs keyed by ICAO code, so cache hits skip both steps
+_BUNDLE_CACHE = TTLCache(maxsize=1024, ttl=METAR_CACHE_TTL)
+_BUNDLE_CACHE_LOCK = Lock()
+
+
+def get_weather_bundle(icao_code):
+    """
+    Fetch and parse the current METAR for an airport.
+
+    Args:
+        icao_code: 4-letter ICAO airport code, already upper-cased
+
+    Returns:
+        tuple: (raw METAR string, WeatherData)
+
+    Raises:
+        MetarFetchError: If data cannot be fetched or code is invalid
+        MetarParseError: If the METAR cannot be parsed
+    """
+    with _BUNDLE_CACHE_LOCK:
+        cached = _BUNDLE_CACHE.get(icao_code)
+    if cached is not None:
+        return cached
+
+    return _store_bundle(icao_code, fetch_metar(icao_code))
+
+
+def prefetch_metars(icao_codes):
+    """
+    Warm the bundle cache for several airports with one API request.
+
+    Airports already cached, and malformed codes, are skipped. Failures
+    are logged or ignored, because each airport is still looked up
+    individually afterwards and reports its own error.
+
+    Args:
+        icao_codes: Upper-case ICAO airport codes
+    """
+    with _BUNDLE_CACHE_LOCK:
+        codes = [c for c in icao_codes if validate_icao_code(c) and c not in _BUNDLE_CACHE]
+
+    if not codes:
+        return
+
+    try:
+        metars = fetch_metars(codes)
+    except MetarFetchError as e:
+        logger.warning("Batch METAR prefetch failed for %s: %s", ','.join(codes), e)
+        return
+
+    for icao_code, raw_metar in metars.items():
+        try:
+            _store_bundle(icao_code, raw_metar)
+        except MetarParseError:
+            # Left uncached; the individual lookup fetches it again and reports the error
+            pass
+
+
+def _store_bundle(icao_code, raw_metar):
+    """Parse a freshly fetched METAR and cache it with its parsed data."""
+    bundle = (raw_metar, parse_metar(raw_metar))
+
+    with _BUNDLE_CACHE_LOCK:
+        _BUNDLE_CACHE[icao_code] = bundle
+
+    return bundle
@@ -15,7 +15,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
         const icaoCode = input.value.trim().toUpperCase();
 
-        if (!icaoCode || icaoCode.length !== 4) {
+        if (!/^[A-Z]{4}$/.test(icaoCode)) {
             showError('Please enter a valid 4-letter ICAO code');
             return;
         }
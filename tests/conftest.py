@@ -1,23 +1,47 @@
 """Pytest configuration and fixtures for METAR reader tests."""
 
 import pytest
-from app import app as flask_app
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def app():
-    """Create Flask application for testing."""
+    """Create Flask application for testing, once per session."""
+    from app import app as flask_app
+
     flask_app.config['TESTING'] = True
     flask_app.config['DEBUG'] = False
     return flask_app
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def client(app):
     """Create Flask test client."""
     return app.test_client()
 
 
+@pytest.fixture(autouse=True)
+def _reset_caches(request):
+    """Clear every module-level cache so no test sees another's results."""
+    from services import metar_parser, metar_service
+    from utils import formatters
+
+    metar_service._BUNDLE_CACHE.clear()
+    metar_parser._PARSE_CACHE.clear()
+
+    # The lru_cache'd formatters
+    for func in vars(formatters).values():
+        if hasattr(func, 'cache_clear'):
+            func.cache_clear()
+
+    # The app is session-scoped, so its response cache outlives each test
+    if 'app' in request.fixturenames:
+        from app import cache
+
+        flask_app = request.getfixturevalue('app')
+        with flask_app.app_context():
+            cache.clear()
+
+
 # Sample METAR strings for testing various conditions
 SAMPLE_METARS = {
     'clear': 'KJFK 081751Z 31021KT 10SM CLR 13/M11 A3012 RMK AO2',
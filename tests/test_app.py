@@ -2,6 +2,7 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
+from models import WeatherData
 from services.metar_fetcher import MetarFetchError
 from services.metar_parser import MetarParseError
 from tests.conftest import SAMPLE_METARS
@@ -16,6 +17,25 @@ class TestRoutes:
         assert response.status_code == 200
         assert b'METAR Weather Reader' in response.data
 
+    def test_index_etag(self, client):
+        """Test homepage carries caching headers and honors If-None-Match."""
+        response = client.get('/')
+        etag = response.headers['ETag']
+        assert 'max-age=300' in response.headers['Cache-Control']
+
+        cached = client.get('/', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+
+    def test_index_etag_compressed(self, client):
+        """Test revalidation works with the ETag of a gzipped homepage."""
+        headers = {'Accept-Encoding': 'gzip'}
+        response = client.get('/', headers=headers)
+        assert response.headers['ETag'].endswith(':gzip"')
+
+        headers['If-None-Match'] = response.headers['ETag']
+        assert client.get('/', headers=headers).status_code == 304
+
     def test_404_error(self, client):
         """Test 404 error handling."""
         response = client.get('/nonexistent')
@@ -25,29 +45,51 @@ class TestRoutes:
         assert 'not found' in data['error'].lower()
 
 
+class TestAppFactory:
+    """Test the create_app factory."""
+
+    def test_create_app_registers_routes(self):
+        """Test a freshly created app serves the API routes."""
+        from app import create_app
+
+        new_app = create_app()
+        rules = {rule.rule for rule in new_app.url_map.iter_rules()}
+        assert '/' in rules
+        assert '/api/weather/<icao:icao_code>' in rules
+        assert '/api/weather' in rules
+
+    @patch('logging.basicConfig')
+    def test_create_app_leaves_logging_alone(self, mock_basic_config):
+        """Test building the app does not configure root logging."""
+        from app import create_app
+
+        create_app()
+        mock_basic_config.assert_not_called()
+
+
 class TestWeatherAPI:
     """Test /api/weather endpoint."""
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_valid_icao_code(self, mock_parse, mock_fetch, client):
         """Test API with valid ICAO code."""
         # Mock the service layer
         mock_fetch.return_value = SAMPLE_METARS['clear']
-        mock_parse.return_value = {
-            'station': 'KJFK',
-            'time': '2026-02-08 17:51 UTC',
-            'temp_f': 55,
-            'temp_c': 13,
-            'wind_speed_mph': 24,
-            'wind_speed_kt': 21,
-            'wind_dir_text': 'NW',
-            'visibility_mi': 10,
-            'pressure_in': 30.12,
-            'pressure_mb': 1020,
-            'sky_conditions': ['CLR'],
-            'weather': []
-        }
+        mock_parse.return_value = WeatherData(
+            station='KJFK',
+            time='2026-02-08 17:51 UTC',
+            temp_f=55,
+            temp_c=13,
+            wind_speed_mph=24,
+            wind_speed_kt=21,
+            wind_dir_text='NW',
+            visibility_mi=10,
+            pressure_in=30.12,
+            pressure_mb=1020,
+            sky_conditions=('CLR',),
+            weather=()
+        )
 
         response = client.get('/api/weather/KJFK')
         assert response.status_code == 200
@@ -62,7 +104,16 @@ class TestWeatherAPI:
         assert 'Temperature' in data['data']
         assert 'Wind' in data['data']
 
-    @patch('app.fetch_metar')
+    @patch('services.metar_service.fetch_metar')
+    def test_malformed_code_not_routed(self, mock_fetch, client):
+        """Test codes that are not 4 letters 404 without reaching the view."""
+        for code in ('KJF', 'KJFKX', 'KJ1K'):
+            response = client.get(f'/api/weather/{code}')
+            assert response.status_code == 404
+            assert response.get_json()['success'] is False
+        mock_fetch.assert_not_called()
+
+    @patch('services.metar_service.fetch_metar')
     def test_fetch_error(self, mock_fetch, client):
         """Test API handles fetch errors."""
         mock_fetch.side_effect = MetarFetchError("Airport not found")
@@ -74,8 +125,8 @@ class TestWeatherAPI:
         assert data['success'] is False
         assert 'Airport not found' in data['error']
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_parse_error(self, mock_parse, mock_fetch, client):
         """Test API handles parse errors."""
         mock_fetch.return_value = "INVALID METAR"
@@ -88,7 +139,7 @@ class TestWeatherAPI:
         assert data['success'] is False
         assert 'parse' in data['error'].lower()
 
-    @patch('app.fetch_metar')
+    @patch('services.metar_service.fetch_metar')
     def test_unexpected_error(self, mock_fetch, client):
         """Test API handles unexpected errors."""
         mock_fetch.side_effect = Exception("Unexpected error")
@@ -100,25 +151,25 @@ class TestWeatherAPI:
         assert data['success'] is False
         assert 'unexpected' in data['error'].lower()
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_rainy_weather(self, mock_parse, mock_fetch, client):
         """Test API with rainy weather conditions."""
         mock_fetch.return_value = SAMPLE_METARS['rain']
-        mock_parse.return_value = {
-            'station': 'KHIO',
-            'time': '2026-02-08 17:57 UTC',
-            'temp_f': 50,
-            'temp_c': 10,
-            'wind_speed_mph': 6,
-            'wind_speed_kt': 5,
-            'wind_dir_text': 'S',
-            'visibility_mi': 2.5,
-            'pressure_in': 30.14,
-            'pressure_mb': 1021,
-            'sky_conditions': ['BKN at 900 ft', 'BKN at 2,900 ft', 'OVC at 3,700 ft'],
-            'weather': ['RA', 'BR']
-        }
+        mock_parse.return_value = WeatherData(
+            station='KHIO',
+            time='2026-02-08 17:57 UTC',
+            temp_f=50,
+            temp_c=10,
+            wind_speed_mph=6,
+            wind_speed_kt=5,
+            wind_dir_text='S',
+            visibility_mi=2.5,
+            pressure_in=30.14,
+            pressure_mb=1021,
+            sky_conditions=('BKN at 900 ft', 'BKN at 2,900 ft', 'OVC at 3,700 ft'),
+            weather=('RA', 'BR')
+        )
 
         response = client.get('/api/weather/KHIO')
         assert response.status_code == 200
@@ -128,25 +179,25 @@ class TestWeatherAPI:
         assert 'RA' in data['data']['Weather Conditions']
         assert data['data']['Visibility'] == '2.5 miles'
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_calm_wind(self, mock_parse, mock_fetch, client):
         """Test API with calm wind conditions."""
         mock_fetch.return_value = SAMPLE_METARS['calm']
-        mock_parse.return_value = {
-            'station': 'KSEA',
-            'time': '2026-02-08 17:53 UTC',
-            'temp_f': 45,
-            'temp_c': 7,
-            'wind_speed_mph': 0,
-            'wind_speed_kt': 0,
-            'wind_dir_text': 'Calm',
-            'visibility_mi': 10,
-            'pressure_in': 30.25,
-            'pressure_mb': 1025,
-            'sky_conditions': ['FEW at 2,200 ft', 'SCT at 5,000 ft', 'BKN at 13,000 ft'],
-            'weather': []
-        }
+        mock_parse.return_value = WeatherData(
+            station='KSEA',
+            time='2026-02-08 17:53 UTC',
+            temp_f=45,
+            temp_c=7,
+            wind_speed_mph=0,
+            wind_speed_kt=0,
+            wind_dir_text='Calm',
+            visibility_mi=10,
+            pressure_in=30.25,
+            pressure_mb=1025,
+            sky_conditions=('FEW at 2,200 ft', 'SCT at 5,000 ft', 'BKN at 13,000 ft'),
+            weather=()
+        )
 
         response = client.get('/api/weather/KSEA')
         assert response.status_code == 200
@@ -156,27 +207,190 @@ class TestWeatherAPI:
         assert data['data']['Wind'] == 'Calm'
 
 
+class TestWeatherViewCache:
+    """Test caching of /api/weather/<icao_code> responses."""
+
+    @patch('services.metar_service.fetch_metar')
+    def test_success_cached(self, mock_fetch, client):
+        """Test a repeat request for the same airport is served from cache."""
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+
+        first = client.get('/api/weather/KJFK')
+        second = client.get('/api/weather/kjfk')
+
+        assert first.get_json() == second.get_json()
+        assert mock_fetch.call_count == 1
+
+    @patch('services.metar_service.fetch_metar')
+    def test_body_reused(self, mock_fetch, client):
+        """Test an unchanged report is built and serialized only once."""
+        import app as app_module
+
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        with patch.object(app_module, '_build_payload', wraps=app_module._build_payload) as mock_build:
+            first = client.get('/api/weather/KJFK')
+            second = client.get('/api/weather/KJFK')
+
+        assert mock_build.call_count == 1
+        assert second.data == first.data
+        assert second.mimetype == 'application/json'
+
+    @patch('services.metar_service.fetch_metar')
+    def test_expires_with_bundle(self, mock_fetch, client):
+        """Test a new report replaces the cached response once the service refetches."""
+        from services import metar_service
+
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        client.get('/api/weather/KJFK')
+
+        # Bundle expiry: the next lookup fetches a newer report
+        metar_service._BUNDLE_CACHE.clear()
+        newer = SAMPLE_METARS['clear'].replace('081751Z', '081851Z')
+        mock_fetch.return_value = newer
+
+        assert client.get('/api/weather/KJFK').get_json()['raw_metar'] == newer
+
+    @patch('services.metar_service.fetch_metar')
+    def test_errors_not_cached(self, mock_fetch, client):
+        """Test failed lookups are retried on the next request."""
+        mock_fetch.side_effect = MetarFetchError("Service down")
+        assert client.get('/api/weather/KJFK').status_code == 400
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        assert client.get('/api/weather/KJFK').status_code == 200
+
+
+class TestWeatherHTTPCaching:
+    """Test HTTP caching headers on /api/weather/<icao_code>."""
+
+    @patch('services.metar_service.fetch_metar')
+    def test_cache_headers(self, mock_fetch, client):
+        """Test successful responses carry an ETag and Cache-Control."""
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+
+        response = client.get('/api/weather/KJFK')
+        assert response.headers['ETag']
+        assert 'max-age=300' in response.headers['Cache-Control']
+
+    @patch('services.metar_service.fetch_metar')
+    def test_not_modified(self, mock_fetch, client):
+        """Test revalidating an unchanged METAR returns 304."""
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        etag = client.get('/api/weather/KJFK').headers['ETag']
+
+        response = client.get('/api/weather/KJFK', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    @patch('services.metar_service.fetch_metar')
+    def test_errors_not_cacheable(self, mock_fetch, client):
+        """Test error responses carry no caching headers."""
+        mock_fetch.side_effect = MetarFetchError("Airport not found")
+
+        response = client.get('/api/weather/ZZZZ')
+        assert 'ETag' not in response.headers
+        assert 'Cache-Control' not in response.headers
+
+
+class TestBatchWeatherAPI:
+    """Test /api/weather?ids= batch endpoint."""
+
+    @patch('services.metar_service.fetch_metars', return_value={})
+    @patch('services.metar_service.fetch_metar')
+    def test_multiple_codes(self, mock_fetch, mock_fetch_many, client):
+        """Test batch lookup returns results keyed by ICAO code."""
+        metars = {'KJFK': SAMPLE_METARS['clear'], 'KSEA': SAMPLE_METARS['calm']}
+        mock_fetch.side_effect = lambda code: metars[code]
+
+        response = client.get('/api/weather?ids=kjfk, KSEA')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['success'] is True
+        assert set(data['results']) == {'KJFK', 'KSEA'}
+        assert data['results']['KJFK']['data']['Location'] == 'KJFK'
+        assert data['results']['KSEA']['raw_metar'] == SAMPLE_METARS['calm']
+
+    @patch('services.metar_service.fetch_metars', return_value={})
+    @patch('services.metar_service.fetch_metar')
+    def test_partial_failure(self, mock_fetch, mock_fetch_many, client):
+        """Test one failing airport does not fail the whole batch."""
+        def fetch(code):
+            if code == 'ZZZZ':
+                raise MetarFetchError("Airport not found")
+            return SAMPLE_METARS['clear']
+        mock_fetch.side_effect = fetch
+
+        response = client.get('/api/weather?ids=KJFK,ZZZZ')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['results']['KJFK']['success'] is True
+        assert data['results']['ZZZZ']['success'] is False
+        assert 'Airport not found' in data['results']['ZZZZ']['error']
+
+    @patch('services.metar_service.fetch_metars', return_value={})
+    @patch('services.metar_service.fetch_metar')
+    def test_duplicate_codes_fetched_once(self, mock_fetch, mock_fetch_many, client):
+        """Test repeated codes are only looked up once."""
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+
+        client.get('/api/weather?ids=KJFK,kjfk,KJFK')
+        assert mock_fetch.call_count == 1
+        mock_fetch_many.assert_called_once_with(['KJFK'])
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_single_upstream_request(self, mock_session, client):
+        """Test all airports are fetched from the API in one request."""
+        body = f"{SAMPLE_METARS['clear']}\n{SAMPLE_METARS['calm']}\n"
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.raw.read.return_value = body.encode('ascii')
+        mock_session.get.return_value = response
+
+        data = client.get('/api/weather?ids=KJFK,KSEA').get_json()
+
+        assert mock_session.get.call_count == 1
+        assert mock_session.get.call_args.kwargs['params'] == {'ids': 'KJFK,KSEA'}
+        assert data['results']['KJFK']['raw_metar'] == SAMPLE_METARS['clear']
+        assert data['results']['KSEA']['raw_metar'] == SAMPLE_METARS['calm']
+
+    def test_missing_ids(self, client):
+        """Test batch lookup without codes is rejected."""
+        response = client.get('/api/weather')
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+    def test_too_many_ids(self, client):
+        """Test batch lookup rejects oversized requests."""
+        ids = ','.join(f'K{chr(65 + i // 26)}{chr(65 + i % 26)}A' for i in range(30))
+        response = client.get(f'/api/weather?ids={ids}')
+        assert response.status_code == 400
+        assert 'too many' in response.get_json()['error'].lower()
+
+
 class TestFormattingHelpers:
     """Test internal formatting helper functions."""
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_format_temperature(self, mock_parse, mock_fetch, client):
         """Test temperature formatting in response."""
         mock_fetch.return_value = SAMPLE_METARS['clear']
-        mock_parse.return_value = {
-            'station': 'KJFK',
-            'temp_f': 55.4,
-            'temp_c': 13.0,
-            'wind_speed_mph': 0,
-            'wind_speed_kt': 0,
-            'wind_dir_text': 'Calm',
-            'visibility_mi': 10,
-            'pressure_in': 30.12,
-            'pressure_mb': 1020,
-            'sky_conditions': [],
-            'weather': []
-        }
+        mock_parse.return_value = WeatherData(
+            station='KJFK',
+            temp_f=55.4,
+            temp_c=13.0,
+            wind_speed_mph=0,
+            wind_speed_kt=0,
+            wind_dir_text='Calm',
+            visibility_mi=10,
+            pressure_in=30.12,
+            pressure_mb=1020,
+            sky_conditions=(),
+            weather=()
+        )
 
         response = client.get('/api/weather/KJFK')
         data = response.get_json()
@@ -185,49 +399,49 @@ class TestFormattingHelpers:
         assert '55°F' in data['data']['Temperature']
         assert '13°C' in data['data']['Temperature']
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_format_visibility(self, mock_parse, mock_fetch, client):
         """Test visibility formatting in response."""
         mock_fetch.return_value = SAMPLE_METARS['clear']
 
         # Test visibility >= 10 miles
-        mock_parse.return_value = {
-            'station': 'KJFK',
-            'temp_f': 55,
-            'temp_c': 13,
-            'wind_speed_mph': 0,
-            'wind_speed_kt': 0,
-            'wind_dir_text': 'Calm',
-            'visibility_mi': 10,
-            'pressure_in': 30.12,
-            'pressure_mb': 1020,
-            'sky_conditions': [],
-            'weather': []
-        }
+        mock_parse.return_value = WeatherData(
+            station='KJFK',
+            temp_f=55,
+            temp_c=13,
+            wind_speed_mph=0,
+            wind_speed_kt=0,
+            wind_dir_text='Calm',
+            visibility_mi=10,
+            pressure_in=30.12,
+            pressure_mb=1020,
+            sky_conditions=(),
+            weather=()
+        )
 
         response = client.get('/api/weather/KJFK')
         data = response.get_json()
         assert data['data']['Visibility'] == '10+ miles'
 
-    @patch('app.fetch_metar')
-    @patch('app.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.parse_metar')
     def test_missing_data_handling(self, mock_parse, mock_fetch, client):
         """Test handling of missing weather data."""
         mock_fetch.return_value = SAMPLE_METARS['clear']
-        mock_parse.return_value = {
-            'station': 'KJFK',
-            'temp_f': None,
-            'temp_c': None,
-            'wind_speed_mph': 0,
-            'wind_speed_kt': 0,
-            'wind_dir_text': 'Calm',
-            'visibility_mi': None,
-            'pressure_in': None,
-            'pressure_mb': None,
-            'sky_conditions': [],
-            'weather': []
-        }
+        mock_parse.return_value = WeatherData(
+            station='KJFK',
+            temp_f=None,
+            temp_c=None,
+            wind_speed_mph=0,
+            wind_speed_kt=0,
+            wind_dir_text='Calm',
+            visibility_mi=None,
+            pressure_in=None,
+            pressure_mb=None,
+            sky_conditions=(),
+            weather=()
+        )
 
         response = client.get('/api/weather/KJFK')
         data = response.get_json()
@@ -236,3 +450,34 @@ class TestFormattingHelpers:
         assert data['data']['Temperature'] == 'Not available'
         assert data['data']['Visibility'] == 'Not available'
         assert data['data']['Pressure'] == 'Not available'
+        assert data['data']['Time'] is None
+
+
+class TestJSONProvider:
+    """Test the orjson-backed JSON provider."""
+
+    def test_error_response_is_json(self, client):
+        """Test error responses are served as JSON."""
+        response = client.get('/nonexistent')
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'success': False, 'error': 'Page not found'}
+
+    def test_keys_sorted(self, app):
+        """Test output keeps Flask's default key ordering."""
+        with app.app_context():
+            assert app.json.dumps({'b': 1, 'a': 2}) == '{"a":2,"b":1}'
+
+    def test_round_trip(self, app):
+        """Test loads reverses dumps."""
+        payload = {'temp': '55°F (13°C)', 'layers': [1, 2]}
+        assert app.json.loads(app.json.dumps(payload)) == payload
+
+
+class TestCompression:
+    """Test response compression."""
+
+    def test_gzip_when_accepted(self, client):
+        """Test responses are compressed for clients that accept gzip."""
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers.get('Content-Encoding') == 'gzip'
@@ -1,17 +1,42 @@
 """Tests for weather data formatting functions."""
 
+import subprocess
+import sys
+
 import pytest
+from models import WeatherData
+from services.metar_parser import _DIRECTIONS
 from utils.formatters import (
+    NOT_AVAILABLE,
+    CALM_WINDS,
     format_temperature,
     format_wind,
     format_visibility,
     format_sky_conditions,
     format_pressure,
     format_weather_phenomena,
-    format_weather_summary
+    format_weather_summary,
+    format_whole_number,
+    _EXPANSIONS,
+    _format_phenomena,
+    _translate
 )
 
 
+class TestFormatWholeNumber:
+    """Test whole-number rounding."""
+
+    def test_rounds_like_round(self):
+        """Test values round half to even, matching round()."""
+        for value in (0.4, 0.5, 1.5, 2.5, 13.0, 55.4, -5, -20.6, 1019.9):
+            assert format_whole_number(value) == str(int(round(value)))
+
+    def test_no_negative_zero(self):
+        """Test small negative values do not render as '-0'."""
+        assert format_whole_number(-0.4) == '0'
+        assert format_whole_number(-0.5) == '0'
+
+
 class TestFormatTemperature:
     """Test temperature formatting."""
 
@@ -21,6 +46,16 @@ class TestFormatTemperature:
         assert '70°F' in result or '71°F' in result  # Rounding can vary
         assert '21°C' in result
 
+    def test_no_negative_zero(self):
+        """Test values just below zero round to '0', not '-0'."""
+        assert format_temperature(31.5, -0.3) == '32°F (0°C)'
+
+    def test_missing_returns_shared_constant(self):
+        """Test missing values return the interned constant."""
+        assert format_temperature(None, None) is NOT_AVAILABLE
+        assert format_visibility(None) is NOT_AVAILABLE
+        assert format_pressure(None, None) is NOT_AVAILABLE
+
     def test_freezing_temperature(self):
         """Test formatting freezing temperature."""
         result = format_temperature(32, 0)
@@ -65,6 +100,25 @@ class TestFormatWind:
         assert '10 mph' in result
         assert 'variable' in result.lower()
 
+    def test_multi_part_direction(self):
+        """Test three-letter directions are spelled out in lower case."""
+        assert format_wind(12, 'NNW') == '12 mph from the north-northwest'
+
+    def test_every_compass_direction_expanded(self):
+        """Test each parser compass name is a key of the expansion table."""
+        keys = {id(k) for k in _EXPANSIONS}
+        for direction in _DIRECTIONS:
+            assert id(direction) in keys
+
+    def test_calm_returns_shared_constant(self):
+        """Test calm wind returns the interned constant."""
+        assert format_wind(0, 'N') is CALM_WINDS
+        assert format_wind(5, 'Calm') is CALM_WINDS
+
+    def test_unknown_direction(self):
+        """Test unknown direction text is passed through in lower case."""
+        assert format_wind(12, 'XYZ') == '12 mph from the xyz'
+
     def test_none_speed(self):
         """Test formatting None wind speed."""
         result = format_wind(None, 'N')
@@ -142,6 +196,14 @@ class TestFormatSkyConditions:
         assert 'Scattered clouds' in result
         assert 'Broken clouds' in result
 
+    def test_layer_without_height(self):
+        """Test a cover code without a height has no trailing text."""
+        assert format_sky_conditions(['OVC']) == 'Overcast'
+
+    def test_unknown_code_kept(self):
+        """Test unrecognized layers are passed through unchanged."""
+        assert format_sky_conditions(['VV at 200 ft']) == 'VV at 200 ft'
+
     def test_no_sky_conditions(self):
         """Test formatting no sky conditions."""
         result = format_sky_conditions([])
@@ -199,6 +261,17 @@ class TestFormatWeatherPhenomena:
         assert 'drifting' in result
         assert 'snow' in result
 
+    def test_drifting_rain(self):
+        """Test adjacent codes are each translated once."""
+        assert format_weather_phenomena(['DRRA']) == 'drifting rain'
+
+    def test_codes_straddling_boundaries(self):
+        """Test codes are matched in order, not across code boundaries."""
+        # 'SH' straddles DS|HZ and 'PR' straddles UP|RA
+        assert format_weather_phenomena(['DSHZ']) == 'dust storm haze'
+        assert format_weather_phenomena(['UPRA']) == 'unknown precipitation rain'
+        assert format_weather_phenomena(['GSSN']) == 'small hail snow'
+
     def test_heavy_rain(self):
         """Test formatting heavy rain."""
         result = format_weather_phenomena(['+RA'])
@@ -216,6 +289,36 @@ class TestFormatWeatherPhenomena:
         result = format_weather_phenomena(['TS'])
         assert 'thunderstorm' in result
 
+    def test_spacing_normalised(self):
+        """Test translations are separated by exactly one space."""
+        assert format_weather_phenomena(['+TSRA']) == 'heavy thunderstorm rain'
+        assert format_weather_phenomena([' -RA BR ']) == 'light rain mist'
+        assert format_weather_phenomena(['VCSH']) == 'VC showers'
+
+    def test_untranslated_text_kept_apart(self):
+        """Test unknown codes next to a translation stay separate words."""
+        assert format_weather_phenomena(['+FC']) == 'heavy FC'
+        assert format_weather_phenomena(['-VCSH']) == 'light VC showers'
+        # Unlike the old replace-and-collapse output, 'rainVC'
+        assert format_weather_phenomena(['RAVC']) == 'rain VC'
+
+    def test_funnel_cloud_report_summary(self):
+        """Test a parsed tornado report reads cleanly in the summary."""
+        from services.metar_parser import parse_metar
+
+        weather_data = parse_metar('KOKC 151853Z 22015KT 3SM +FC TSRA BKN010CB 24/21 A2960')
+        assert 'with heavy FC, thunderstorm rain.' in format_weather_summary(weather_data)
+
+    def test_tokens_translated_once(self):
+        """Test each phenomenon token is translated once across combinations."""
+        _format_phenomena.cache_clear()
+        _translate.cache_clear()
+        format_weather_phenomena(['-RA', 'BR'])
+        format_weather_phenomena(['-RA', 'FG'])
+        info = _translate.cache_info()
+        assert info.hits == 1
+        assert info.misses == 3
+
     def test_multiple_phenomena(self):
         """Test formatting multiple weather phenomena."""
         result = format_weather_phenomena(['RA', 'BR'])
@@ -290,3 +393,46 @@ class TestFormatWeatherSummary:
         # Should handle missing data gracefully
         assert 'Calm' in result
         assert len(result) > 0
+
+    def test_weather_data_summary(self):
+        """Test summary accepts WeatherData as well as dictionaries."""
+        data = {
+            'temp_f': 50,
+            'temp_c': 10,
+            'wind_speed_mph': 5,
+            'wind_dir_text': 'S',
+            'visibility_mi': 3,
+            'pressure_in': 29.90,
+            'pressure_mb': 1013,
+            'sky_conditions': ['OVC at 1,000 ft'],
+            'weather': ['RA']
+        }
+        assert format_weather_summary(WeatherData.from_dict(data)) == format_weather_summary(data)
+
+    def test_summary_cached_for_identical_data(self):
+        """Test identical WeatherData reuses the cached summary."""
+        data = WeatherData(temp_f=41, temp_c=5, wind_speed_mph=3, wind_dir_text='E')
+        first = format_weather_summary(data)
+        second = format_weather_summary(WeatherData(temp_f=41, temp_c=5, wind_speed_mph=3,
+                                                    wind_dir_text='E'))
+        assert first is second
+
+    def test_unhashable_weather_data(self):
+        """Test WeatherData built with lists is summarized without caching."""
+        data = WeatherData(sky_conditions=['OVC at 1,000 ft'], weather=['RA'])
+        result = format_weather_summary(data)
+        assert 'Overcast' in result
+        assert 'rain' in result
+
+
+class TestModuleImports:
+    """Test the formatters stay independent of the service layer."""
+
+    def test_does_not_import_services(self):
+        """Test importing the formatters loads no METAR parsing code."""
+        code = (
+            "import sys, utils.formatters; "
+            "assert 'services.metar_parser' not in sys.modules; "
+            "assert 'metar' not in sys.modules"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
@@ -0,0 +1,117 @@
+"""Tests for METAR fetching from aviationweather.gov."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from services import metar_fetcher
+from services.metar_fetcher import fetch_metar, fetch_metars, validate_icao_code, MetarFetchError
+from tests.conftest import SAMPLE_METARS
+
+
+def _mock_response(text):
+    """Build a fake successful API response with the given body."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.raw.read.return_value = text.encode('ascii')
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestValidateIcaoCode:
+    """Test ICAO code validation."""
+
+    def test_valid_codes(self):
+        """Test four-letter codes are accepted in any case."""
+        assert validate_icao_code('KJFK')
+        assert validate_icao_code('egll')
+
+    def test_invalid_codes(self):
+        """Test malformed codes are rejected."""
+        assert not validate_icao_code('')
+        assert not validate_icao_code(None)
+        assert not validate_icao_code('KJF')
+        assert not validate_icao_code('KJFKX')
+        assert not validate_icao_code('KJ1K')
+        assert not validate_icao_code('KJF\n')
+
+    def test_non_ascii_letters_rejected(self):
+        """Test non-ASCII letters are not accepted as ICAO codes."""
+        assert not validate_icao_code('ÄBCD')
+
+
+class TestFetchMetar:
+    """Test fetching METAR data."""
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_fetch_valid_code(self, mock_session):
+        """Test fetching returns the stripped METAR text."""
+        mock_session.get.return_value = _mock_response(SAMPLE_METARS['clear'] + '\n')
+
+        result = fetch_metar('kjfk')
+
+        assert result == SAMPLE_METARS['clear']
+        assert mock_session.get.call_args.kwargs['params'] == {'ids': 'KJFK'}
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_body_read_is_bounded(self, mock_session):
+        """Test only a bounded prefix of the response body is read."""
+        mock_session.get.return_value = _mock_response(SAMPLE_METARS['clear'])
+
+        fetch_metar('KJFK')
+
+        assert mock_session.get.call_args.kwargs['stream'] is True
+        read_args = mock_session.get.return_value.raw.read.call_args
+        assert read_args.args[0] == metar_fetcher._MAX_BODY_BYTES
+        assert read_args.kwargs['decode_content'] is True
+
+    def test_invalid_code(self):
+        """Test invalid ICAO codes are rejected before any request."""
+        with pytest.raises(MetarFetchError):
+            fetch_metar('KJ1')
+
+
+class TestFetchMetars:
+    """Test fetching several airports in one request."""
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_one_request_keyed_by_station(self, mock_session):
+        """Test reports are split per line and keyed by station."""
+        body = f"{SAMPLE_METARS['clear']}\nMETAR {SAMPLE_METARS['calm']}\n"
+        mock_session.get.return_value = _mock_response(body)
+
+        result = fetch_metars(['kjfk', 'KSEA', 'ZZZZ'])
+
+        assert mock_session.get.call_count == 1
+        assert mock_session.get.call_args.kwargs['params'] == {'ids': 'KJFK,KSEA,ZZZZ'}
+        assert result == {
+            'KJFK': SAMPLE_METARS['clear'],
+            'KSEA': 'METAR ' + SAMPLE_METARS['calm'],
+        }
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_duplicate_codes_requested_once(self, mock_session):
+        """Test repeated codes appear once in the request."""
+        mock_session.get.return_value = _mock_response(SAMPLE_METARS['clear'])
+
+        result = fetch_metars(['KJFK', 'kjfk', 'KSEA'])
+
+        assert mock_session.get.call_args.kwargs['params'] == {'ids': 'KJFK,KSEA'}
+        assert result == {'KJFK': SAMPLE_METARS['clear']}
+
+    def test_invalid_code(self):
+        """Test any malformed code rejects the whole batch."""
+        with pytest.raises(MetarFetchError):
+            fetch_metars(['KJFK', 'K1'])
+
+
+class TestFetchNotCached:
+    """Test the fetcher leaves caching to metar_service."""
+
+    @patch('services.metar_fetcher._SESSION')
+    def test_repeat_fetch_requests_again(self, mock_session):
+        """Test every fetch goes to the API."""
+        mock_session.get.return_value = _mock_response(SAMPLE_METARS['clear'])
+
+        fetch_metar('KJFK')
+        fetch_metar('KJFK')
+
+        assert mock_session.get.call_count == 2
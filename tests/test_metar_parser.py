@@ -1,7 +1,14 @@
 """Tests for METAR parsing with real METAR strings."""
 
+import sys
 import pytest
-from services.metar_parser import parse_metar, MetarParseError, _degrees_to_compass
+from dataclasses import FrozenInstanceError
+from unittest.mock import patch
+from services import metar_parser
+from services.metar_parser import (
+    parse_metar, MetarParseError, WeatherData, _degrees_to_compass,
+    _DIRECTIONS, WIND_VARIABLE
+)
 from tests.conftest import SAMPLE_METARS
 
 
@@ -13,79 +20,79 @@ class TestMetarParser:
         metar = SAMPLE_METARS['clear']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KJFK'
-        assert data['temp_c'] is not None
-        assert data['temp_f'] is not None
-        assert data['wind_speed_kt'] > 0
-        assert data['visibility_mi'] == 10
-        assert data['pressure_in'] is not None
-        assert 'CLR' in str(data['sky_conditions']) or len(data['sky_conditions']) == 0
+        assert data.station == 'KJFK'
+        assert data.temp_c is not None
+        assert data.temp_f is not None
+        assert data.wind_speed_kt > 0
+        assert data.visibility_mi == 10
+        assert data.pressure_in is not None
+        assert 'CLR' in str(data.sky_conditions) or len(data.sky_conditions) == 0
 
     def test_parse_rain(self):
         """Test parsing METAR with rain."""
         metar = SAMPLE_METARS['rain']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KHIO'
-        assert 'RA' in data['weather']  # Rain
-        assert 'BR' in data['weather']  # Mist
-        assert data['visibility_mi'] < 10
+        assert data.station == 'KHIO'
+        assert 'RA' in data.weather  # Rain
+        assert 'BR' in data.weather  # Mist
+        assert data.visibility_mi < 10
 
     def test_parse_snow(self):
         """Test parsing METAR with drifting snow."""
         metar = SAMPLE_METARS['snow']
         data = parse_metar(metar)
 
-        assert data['station'] == 'CYHZ'
-        assert any('DR' in w or 'SN' in w for w in data['weather'])  # Drifting snow
-        assert data['temp_c'] < 0  # Below freezing
+        assert data.station == 'CYHZ'
+        assert any('DR' in w or 'SN' in w for w in data.weather)  # Drifting snow
+        assert data.temp_c < 0  # Below freezing
 
     def test_parse_fog(self):
         """Test parsing METAR with fog."""
         metar = SAMPLE_METARS['fog']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KSFO'
-        assert 'FG' in data['weather']  # Fog
-        assert data['visibility_mi'] < 1  # Low visibility
+        assert data.station == 'KSFO'
+        assert 'FG' in data.weather  # Fog
+        assert data.visibility_mi < 1  # Low visibility
 
     def test_parse_thunderstorm(self):
         """Test parsing METAR with thunderstorm."""
         metar = SAMPLE_METARS['thunderstorm']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KMIA'
+        assert data.station == 'KMIA'
         # Should have thunderstorm indicators
-        assert any('TS' in w or '+' in w or 'RA' in w for w in data['weather'])
-        assert data['visibility_mi'] < 10
+        assert any('TS' in w or '+' in w or 'RA' in w for w in data.weather)
+        assert data.visibility_mi < 10
 
     def test_parse_calm_wind(self):
         """Test parsing METAR with calm winds."""
         metar = SAMPLE_METARS['calm']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KSEA'
-        assert data['wind_speed_kt'] == 0
-        assert data['wind_speed_mph'] == 0
+        assert data.station == 'KSEA'
+        assert data.wind_speed_kt == 0
+        assert data.wind_speed_mph == 0
         # With 00000KT, direction is reported but speed is 0
-        assert data['wind_dir_text'] in ('Calm', 'N')  # Parser may vary
+        assert data.wind_dir_text in ('Calm', 'N')  # Parser may vary
 
     def test_parse_variable_wind(self):
         """Test parsing METAR with variable wind."""
         metar = SAMPLE_METARS['variable_wind']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KATL'
+        assert data.station == 'KATL'
         # Variable winds may have no direction or special handling
-        assert data['wind_speed_kt'] > 0
+        assert data.wind_speed_kt > 0
 
     def test_parse_light_rain(self):
         """Test parsing METAR with light rain (- prefix)."""
         metar = SAMPLE_METARS['light_rain']
         data = parse_metar(metar)
 
-        assert data['station'] == 'KORD'
-        assert any('-' in w or 'RA' in w for w in data['weather'])  # Light rain
+        assert data.station == 'KORD'
+        assert any('-' in w or 'RA' in w for w in data.weather)  # Light rain
 
     def test_parse_empty_string(self):
         """Test parsing empty METAR string raises error."""
@@ -103,14 +110,66 @@ class TestMetarParser:
         metar = "KORD 081800Z 00000KT 10SM CLR 15/10 A3000"
         data = parse_metar(metar)
 
-        assert data['station'] == 'KORD'
-        assert data['wind_speed_kt'] == 0
-        assert data['temp_c'] is not None
-        assert data['visibility_mi'] == 10
-        # All fields should be present in dict even if None
-        assert 'temp_c' in data
-        assert 'visibility_mi' in data
-        assert 'pressure_in' in data
+        assert data.station == 'KORD'
+        assert data.wind_speed_kt == 0
+        assert data.temp_c is not None
+        assert data.visibility_mi == 10
+        # All fields should be present even if None
+        assert hasattr(data, 'temp_c')
+        assert hasattr(data, 'visibility_mi')
+        assert hasattr(data, 'pressure_in')
+
+
+class TestWeatherData:
+    """Test the WeatherData container."""
+
+    def test_parse_returns_weather_data(self):
+        """Test parse_metar returns a WeatherData instance."""
+        assert isinstance(parse_metar(SAMPLE_METARS['clear']), WeatherData)
+
+    def test_from_dict(self):
+        """Test building from a dict converts lists and ignores unknown keys."""
+        data = WeatherData.from_dict({
+            'station': 'KJFK',
+            'temp_c': 13,
+            'weather': ['RA'],
+            'extra': 'ignored',
+        })
+
+        assert data.station == 'KJFK'
+        assert data.temp_c == 13
+        assert data.weather == ('RA',)
+        assert data.sky_conditions == ()
+        assert data.pressure_in is None
+
+
+class TestParseCache:
+    """Test memoization of parsed METARs."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty parse cache."""
+        metar_parser._PARSE_CACHE.clear()
+        yield
+        metar_parser._PARSE_CACHE.clear()
+
+    def test_repeat_parse_skips_parser(self):
+        """Test parsing the same METAR twice only runs the parser once."""
+        metar = SAMPLE_METARS['rain']
+        with patch('services.metar_parser.Metar', wraps=metar_parser.Metar) as mock_metar:
+            first = parse_metar(metar)
+            second = parse_metar(metar)
+
+        assert first == second
+        assert mock_metar.call_count == 1
+
+    def test_cached_result_immutable(self):
+        """Test a returned result cannot be mutated to corrupt the cache."""
+        data = parse_metar(SAMPLE_METARS['rain'])
+
+        with pytest.raises(FrozenInstanceError):
+            data.station = 'XXXX'
+        assert isinstance(data.weather, tuple)
 
 
 class TestCompassConversion:
@@ -151,3 +210,20 @@ class TestCompassConversion:
         assert _degrees_to_compass(350) == 'N'
         # Just after North (0 + 11.25 = 0 to 11.25)
         assert _degrees_to_compass(10) == 'N'
+        assert _degrees_to_compass(12) == 'NNE'
+
+    def test_float_degrees(self):
+        """Test float directions from the parser are handled."""
+        assert _degrees_to_compass(90.0) == 'E'
+        assert _degrees_to_compass(359.0) == 'N'
+
+    def test_every_degree_matches_sector(self):
+        """Test each whole degree maps to its 22.5 degree compass sector."""
+        for degrees in range(361):
+            expected = _DIRECTIONS[int((degrees + 11.25) / 22.5) % 16]
+            assert _degrees_to_compass(degrees) == expected
+
+    def test_results_interned(self):
+        """Test compass names and sentinels are interned strings."""
+        assert _degrees_to_compass(None) is WIND_VARIABLE
+        assert _degrees_to_compass(200) is sys.intern(''.join(['S', 'SW']))
@@ -0,0 +1,91 @@
+"""Tests for the combined fetch-and-parse METAR service."""
+
+import pytest
+from unittest.mock import patch
+from services import metar_service
+from services.metar_fetcher import MetarFetchError
+from models import WeatherData
+from services.metar_service import get_weather_bundle, prefetch_metars
+from tests.conftest import SAMPLE_METARS
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty bundle cache."""
+    metar_service._BUNDLE_CACHE.clear()
+    yield
+    metar_service._BUNDLE_CACHE.clear()
+
+
+class TestGetWeatherBundle:
+    """Test fetching and parsing through the service."""
+
+    @patch('services.metar_service.fetch_metar')
+    def test_returns_raw_and_parsed(self, mock_fetch):
+        """Test the bundle holds the raw METAR and its parsed data."""
+        mock_fetch.return_value = SAMPLE_METARS['rain']
+
+        raw_metar, weather_data = get_weather_bundle('KHIO')
+
+        assert raw_metar == SAMPLE_METARS['rain']
+        assert isinstance(weather_data, WeatherData)
+        assert weather_data.station == 'KHIO'
+
+    @patch('services.metar_service.parse_metar')
+    @patch('services.metar_service.fetch_metar')
+    def test_hit_skips_fetch_and_parse(self, mock_fetch, mock_parse):
+        """Test a cached airport is neither fetched nor parsed again."""
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        mock_parse.return_value = WeatherData(station='KJFK')
+
+        first = get_weather_bundle('KJFK')
+        second = get_weather_bundle('KJFK')
+
+        assert first == second
+        assert mock_fetch.call_count == 1
+        assert mock_parse.call_count == 1
+
+    @patch('services.metar_service.fetch_metar')
+    def test_errors_not_cached(self, mock_fetch):
+        """Test failed lookups are retried on the next call."""
+        mock_fetch.side_effect = MetarFetchError("Service down")
+        with pytest.raises(MetarFetchError):
+            get_weather_bundle('KJFK')
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = SAMPLE_METARS['clear']
+        assert get_weather_bundle('KJFK')[0] == SAMPLE_METARS['clear']
+
+
+class TestPrefetchMetars:
+    """Test warming the bundle cache from one batch request."""
+
+    @patch('services.metar_service.fetch_metar')
+    @patch('services.metar_service.fetch_metars')
+    def test_prefetched_airports_not_fetched_again(self, mock_fetch_many, mock_fetch):
+        """Test prefetched airports are served from the bundle cache."""
+        mock_fetch_many.return_value = {'KJFK': SAMPLE_METARS['clear']}
+
+        prefetch_metars(['KJFK'])
+        raw_metar, weather_data = get_weather_bundle('KJFK')
+
+        assert raw_metar == SAMPLE_METARS['clear']
+        assert weather_data.station == 'KJFK'
+        mock_fetch.assert_not_called()
+
+    @patch('services.metar_service.fetch_metars')
+    def test_cached_airports_skipped(self, mock_fetch_many):
+        """Test airports already in the bundle cache are not requested."""
+        mock_fetch_many.return_value = {'KJFK': SAMPLE_METARS['clear']}
+        prefetch_metars(['KJFK'])
+
+        prefetch_metars(['KJFK', 'KSEA'])
+        mock_fetch_many.assert_called_with(['KSEA'])
+
+    @patch('services.metar_service.fetch_metars')
+    def test_unparseable_report_not_cached(self, mock_fetch_many):
+        """Test a report that fails to parse is left for the individual lookup."""
+        mock_fetch_many.return_value = {'KJFK': 'KJFK garbage'}
+
+        prefetch_metars(['KJFK'])
+        assert 'KJFK' not in metar_service._BUNDLE_CACHE
@@ -1,6 +1,114 @@
 """Formatters for converting METAR data to human-readable text."""
 
+import re
+import sys
+from functools import lru_cache
+
+from models import WeatherData, WIND_CALM, WIND_VARIABLE
+
+# Cloud cover codes and their plain English labels
+_CLOUD_LABELS = {
+    'FEW': 'Few clouds',
+    'SCT': 'Scattered clouds',
+    'BKN': 'Broken clouds',
+    'OVC': 'Overcast',
+}
+_CLEAR_SKY_CODES = frozenset(('SKC', 'CLR'))
+_SKY_NOT_REPORTED = "Sky conditions not reported"
+
+# Shared text for missing values and calm wind, interned so callers comparing
+# against these constants match on identity
+NOT_AVAILABLE = sys.intern("Not available")
+CALM_WINDS = sys.intern("Calm winds")
+
+# Full names for 16-point compass abbreviations. Keys are interned to match
+# the parser's compass names, so lookups resolve on identity.
+_EXPANSIONS = {sys.intern(k): v for k, v in {
+    'N': 'North',
+    'NNE': 'North-Northeast',
+    'NE': 'Northeast',
+    'ENE': 'East-Northeast',
+    'E': 'East',
+    'ESE': 'East-Southeast',
+    'SE': 'Southeast',
+    'SSE': 'South-Southeast',
+    'S': 'South',
+    'SSW': 'South-Southwest',
+    'SW': 'Southwest',
+    'WSW': 'West-Southwest',
+    'W': 'West',
+    'WNW': 'West-Northwest',
+    'NW': 'Northwest',
+    'NNW': 'North-Northwest',
+}.items()}
+
+# Lower-case variants for use mid-sentence
+_EXPANSIONS_LOWER = {k: v.lower() for k, v in _EXPANSIONS.items()}
+
+# Common weather phenomenon translations
+_PHENOMENA = {
+    '+': 'heavy',
+    '-': 'light',
+    'TS': 'thunderstorm',
+    'SH': 'showers',
+    'FZ': 'freezing',
+    'BL': 'blowing',
+    'DR': 'drifting',
+    'MI': 'shallow',
+    'BC': 'patches',
+    'PR': 'partial',
+    'RA': 'rain',
+    'SN': 'snow',
+    'DZ': 'drizzle',
+    'FG': 'fog',
+    'BR': 'mist',
+    'HZ': 'haze',
+    'VA': 'volcanic ash',
+    'DU': 'dust',
+    'SA': 'sand',
+    'FU': 'smoke',
+    'PY': 'spray',
+    'SQ': 'squalls',
+    'PO': 'dust whirls',
+    'DS': 'dust storm',
+    'SS': 'sandstorm',
+    'GR': 'hail',
+    'GS': 'small hail',
+    'UP': 'unknown precipitation',
+    'IC': 'ice crystals',
+    'PL': 'ice pellets',
+    'SG': 'snow grains',
+}
+
+# Splits a phenomenon string into tokens: a known code (group 1; longer codes
+# are tried first) or a run of other non-space text (group 2), such as 'VC'.
+# Tokens are joined with single spaces, so no whitespace clean-up is needed.
+_PHENOMENON_CODES = '|'.join(
+    re.escape(code) for code in sorted(_PHENOMENA, key=len, reverse=True)
+)
+_PHENOMENA_RE = re.compile(
+    rf'({_PHENOMENON_CODES})|((?:(?!{_PHENOMENON_CODES})\S)+)',
+    re.ASCII
+)
+
+
+def format_whole_number(value):
+    """
+    Format a number rounded to the nearest whole number.
+
+    Rounds half to even like round(), but never renders negative zero.
+
+    Args:
+        value: Number to format
+
+    Returns:
+        str: Rounded number as text (e.g., '13', '-5')
+    """
+    text = f"{value:.0f}"
+    return '0' if text == '-0' else text
 
+
+@lru_cache(maxsize=256)
 def format_temperature(temp_f, temp_c):
     """
     Format temperature in both Fahrenheit and Celsius.
@@ -13,11 +121,12 @@ def format_temperature(temp_f, temp_c):
         str: Formatted temperature string
     """
     if temp_f is None or temp_c is None:
-        return "Not available"
+        return NOT_AVAILABLE
 
-    return f"{int(round(temp_f))}°F ({int(round(temp_c))}°C)"
+    return f"{format_whole_number(temp_f)}°F ({format_whole_number(temp_c)}°C)"
 
 
+@lru_cache(maxsize=256)
 def format_wind(speed_mph, direction_text):
     """
     Format wind information in plain English.
@@ -30,19 +139,21 @@ def format_wind(speed_mph, direction_text):
         str: Formatted wind string
     """
     if speed_mph is None or speed_mph == 0:
-        return "Calm winds"
+        return CALM_WINDS
 
-    speed = int(round(speed_mph))
+    speed = format_whole_number(speed_mph)
 
-    if direction_text == 'Calm':
-        return "Calm winds"
-    elif direction_text == 'Variable':
+    if direction_text == WIND_CALM:
+        return CALM_WINDS
+    elif direction_text == WIND_VARIABLE:
         return f"{speed} mph from variable directions"
     else:
-        direction_full = _expand_compass_direction(direction_text)
-        return f"{speed} mph from the {direction_full.lower()}"
+        # Only lower-case unknown directions; a .get() default would run every call
+        direction_full = _EXPANSIONS_LOWER.get(direction_text) or direction_text.lower()
+        return f"{speed} mph from the {direction_full}"
 
 
+@lru_cache(maxsize=256)
 def format_visibility(visibility_mi):
     """
     Format visibility in plain English.
@@ -54,13 +165,13 @@ def format_visibility(visibility_mi):
         str: Formatted visibility string
     """
     if visibility_mi is None:
-        return "Not available"
+        return NOT_AVAILABLE
 
-    vis = round(visibility_mi, 1)
+    vis = round(float(visibility_mi), 1)
 
     if vis >= 10:
         return "10+ miles (unlimited)"
-    elif vis == int(vis):
+    elif vis.is_integer():
         return f"{int(vis)} miles"
     else:
         return f"{vis} miles"
@@ -77,30 +188,35 @@ def format_sky_conditions(sky_conditions):
         str: Formatted sky conditions string
     """
     if not sky_conditions:
-        return "Sky conditions not reported"
+        return _SKY_NOT_REPORTED
 
-    formatted = []
+    # Write pieces and separators straight into one buffer, joined once
+    buf = []
+    append = buf.append
 
     for condition in sky_conditions:
-        if 'SKC' in condition or 'CLR' in condition:
+        # Cloud layers start with a 3-letter cover code (e.g., 'BKN at 900 ft')
+        code = condition[:3]
+        if code in _CLEAR_SKY_CODES:
             return "Clear skies"
-        elif 'FEW' in condition:
-            formatted.append(f"Few clouds {condition.replace('FEW', '').strip()}")
-        elif 'SCT' in condition:
-            formatted.append(f"Scattered clouds {condition.replace('SCT', '').strip()}")
-        elif 'BKN' in condition:
-            formatted.append(f"Broken clouds {condition.replace('BKN', '').strip()}")
-        elif 'OVC' in condition:
-            formatted.append(f"Overcast {condition.replace('OVC', '').strip()}")
-        else:
-            formatted.append(condition)
 
-    if not formatted:
-        return "Sky conditions not reported"
+        label = _CLOUD_LABELS.get(code)
+        if label is None:
+            append(condition)
+        elif len(condition) > 3:
+            append(label)
+            append(' ')
+            append(condition[3:].strip())
+        else:
+            append(label)
+        append(', ')
 
-    return ', '.join(formatted)
+    # Drop the trailing separator
+    buf.pop()
+    return ''.join(buf)
 
 
+@lru_cache(maxsize=256)
 def format_pressure(pressure_in, pressure_mb):
     """
     Format atmospheric pressure.
@@ -113,9 +229,9 @@ def format_pressure(pressure_in, pressure_mb):
         str: Formatted pressure string
     """
     if pressure_in is None or pressure_mb is None:
-        return "Not available"
+        return NOT_AVAILABLE
 
-    return f"{pressure_in:.2f} inHg ({int(round(pressure_mb))} mb)"
+    return f"{pressure_in:.2f} inHg ({format_whole_number(pressure_mb)} mb)"
 
 
 def format_weather_phenomena(weather_list):
@@ -131,54 +247,28 @@ def format_weather_phenomena(weather_list):
     if not weather_list:
         return None
 
-    # Common weather translations
-    # Order matters - process longer codes first to avoid partial replacements
-    translations = [
-        ('+', 'heavy '),
-        ('-', 'light '),
-        ('TS', 'thunderstorm'),
-        ('SH', 'showers'),
-        ('FZ', 'freezing'),
-        ('BL', 'blowing'),
-        ('DR', 'drifting'),
-        ('MI', 'shallow'),
-        ('BC', 'patches'),
-        ('PR', 'partial'),
-        ('RA', 'rain'),
-        ('SN', 'snow'),
-        ('DZ', 'drizzle'),
-        ('FG', 'fog'),
-        ('BR', 'mist'),
-        ('HZ', 'haze'),
-        ('VA', 'volcanic ash'),
-        ('DU', 'dust'),
-        ('SA', 'sand'),
-        ('FU', 'smoke'),
-        ('PY', 'spray'),
-        ('SQ', 'squalls'),
-        ('PO', 'dust whirls'),
-        ('DS', 'dust storm'),
-        ('SS', 'sandstorm'),
-        ('GR', 'hail'),
-        ('GS', 'small hail'),
-        ('UP', 'unknown precipitation'),
-        ('IC', 'ice crystals'),
-        ('PL', 'ice pellets'),
-        ('SG', 'snow grains'),
-    ]
-
-    formatted = []
-    for phenomenon in weather_list:
-        weather_str = phenomenon
-        # Process translations in order
-        for code, translation in translations:
-            weather_str = weather_str.replace(code, f' {translation}')
-        # Clean up extra spaces and strip
-        weather_str = ' '.join(weather_str.split()).strip()
-        if weather_str:
-            formatted.append(weather_str)
-
-    return ', '.join(formatted)
+    return _format_phenomena(tuple(weather_list))
+
+
+@lru_cache(maxsize=256)
+def _format_phenomena(weather):
+    """Translate a tuple of phenomenon codes; cached since the set is small."""
+    # Translate each phenomenon, dropping empty results
+    return ', '.join([
+        weather_str
+        for phenomenon in weather
+        if (weather_str := _translate(phenomenon))
+    ])
+
+
+@lru_cache(maxsize=256)
+def _translate(phenomenon):
+    """Translate one phenomenon string; a few dozen tokens cover most reports."""
+    # Translate every code in a single left-to-right pass
+    return ' '.join([
+        _PHENOMENA[code] if code else other
+        for code, other in _PHENOMENA_RE.findall(phenomenon)
+    ])
 
 
 def format_weather_summary(weather_data):
@@ -186,87 +276,74 @@ def format_weather_summary(weather_data):
     Create a complete plain English summary of weather conditions.
 
     Args:
-        weather_data: Dictionary of parsed METAR data
+        weather_data: WeatherData, or a dictionary of parsed METAR data
 
     Returns:
         str: Human-readable weather summary
     """
-    summary_parts = []
+    if isinstance(weather_data, dict):
+        weather_data = WeatherData.from_dict(weather_data)
+
+    try:
+        hash(weather_data)
+    except TypeError:
+        # Built with list fields, so it cannot be a cache key
+        return _summarize(weather_data)
+
+    return _summarize_cached(weather_data)
+
+
+def _summarize(weather_data):
+    """Build the plain English summary for WeatherData."""
+    # Fragments are emitted with their separators and joined once at the end
+    parts = []
+    append = parts.append
 
     # Sky conditions
-    sky = format_sky_conditions(weather_data.get('sky_conditions', []))
-    if sky and 'not reported' not in sky.lower():
-        summary_parts.append(sky)
+    sky = format_sky_conditions(weather_data.sky_conditions)
+    if sky != _SKY_NOT_REPORTED:
+        append(sky)
+        append('. ')
 
     # Weather phenomena (rain, snow, etc.)
-    weather = format_weather_phenomena(weather_data.get('weather', []))
+    weather = format_weather_phenomena(weather_data.weather)
     if weather:
-        summary_parts.append(f"with {weather}")
+        append('with ')
+        append(weather)
+        append('. ')
 
     # Temperature
-    temp_f = weather_data.get('temp_f')
-    temp_c = weather_data.get('temp_c')
+    temp_f = weather_data.temp_f
     if temp_f is not None:
-        temp_str = format_temperature(temp_f, temp_c)
-        summary_parts.append(f"Temperature is {temp_str}")
+        append('Temperature is ')
+        append(format_temperature(temp_f, weather_data.temp_c))
+        append('. ')
 
     # Wind
-    wind_speed = weather_data.get('wind_speed_mph', 0)
-    wind_dir = weather_data.get('wind_dir_text', 'Variable')
-    wind_str = format_wind(wind_speed, wind_dir)
-    summary_parts.append(wind_str)
+    append(format_wind(weather_data.wind_speed_mph, weather_data.wind_dir_text))
+    append('. ')
 
     # Visibility
-    visibility = weather_data.get('visibility_mi')
+    visibility = weather_data.visibility_mi
     if visibility is not None:
-        vis_str = format_visibility(visibility)
-        summary_parts.append(f"Visibility is {vis_str}")
+        append('Visibility is ')
+        append(format_visibility(visibility))
+        append('. ')
 
     # Pressure
-    pressure_in = weather_data.get('pressure_in')
-    pressure_mb = weather_data.get('pressure_mb')
+    pressure_in = weather_data.pressure_in
     if pressure_in is not None:
-        pressure_str = format_pressure(pressure_in, pressure_mb)
-        summary_parts.append(f"Barometric pressure is {pressure_str}")
+        append('Barometric pressure is ')
+        append(format_pressure(pressure_in, weather_data.pressure_mb))
+        append('. ')
 
-    # Join all parts with appropriate punctuation
-    if len(summary_parts) == 0:
+    if not parts:
         return "Weather data unavailable."
 
-    summary = '. '.join(summary_parts)
-    if not summary.endswith('.'):
-        summary += '.'
-
-    return summary
+    # Replace the trailing separator with a single full stop
+    parts[-1] = '' if parts[-2].endswith('.') else '.'
+    return ''.join(parts)
 
 
-def _expand_compass_direction(direction):
-    """
-    Expand compass abbreviation to full name.
-
-    Args:
-        direction: Compass abbreviation (N, NE, etc.)
-
-    Returns:
-        str: Full direction name
-    """
-    expansions = {
-        'N': 'North',
-        'NNE': 'North-Northeast',
-        'NE': 'Northeast',
-        'ENE': 'East-Northeast',
-        'E': 'East',
-        'ESE': 'East-Southeast',
-        'SE': 'Southeast',
-        'SSE': 'South-Southeast',
-        'S': 'South',
-        'SSW': 'South-Southwest',
-        'SW': 'Southwest',
-        'WSW': 'West-Southwest',
-        'W': 'West',
-        'WNW': 'West-Northwest',
-        'NW': 'Northwest',
-        'NNW': 'North-Northwest',
-    }
-
-    return expansions.get(direction, direction)
+# Identical reports (same WeatherData) always produce the same summary
+_summarize_cached = lru_cache(maxsize=256)(_summarize)